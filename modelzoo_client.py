@@ -5,9 +5,39 @@ Provides a simple API to load models and metadata from the Git-backed model cata
 Version IDs match MLflow Model Registry (v1, v2, v3, ...).
 """
 
+import copy
+import functools
 from pathlib import Path
 
-MODELZOO_ROOT = Path(__file__).resolve().parent / "models"
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+MODELZOO_ROOT = Path(__file__).parent / "models"
+
+
+@functools.lru_cache(maxsize=128)
+def _model_root(zoo_root: Path, model_name: str) -> Path:
+    """Resolve <zoo_root>/<model_name> once, on first use rather than at import."""
+    return (zoo_root / model_name).resolve()
+
+
+@functools.lru_cache(maxsize=128)
+def _latest_version(index_path: Path, mtime_ns: int, size: int) -> int | str:
+    """latest.version from index.yaml; keyed on mtime/size so pipeline pushes are seen."""
+    with index_path.open() as f:
+        index = yaml.load(f, Loader=_Loader)
+    return index["latest"]["version"]
+
+
+@functools.lru_cache(maxsize=128)
+def _load_metadata(meta_path: Path, mtime_ns: int, size: int) -> dict:
+    """Parsed metadata.yaml; keyed on mtime/size so pipeline status updates are seen."""
+    with meta_path.open() as f:
+        return yaml.load(f, Loader=_Loader)
 
 
 def get_model_dir(model_name: str, version: int | str = "latest") -> Path:
@@ -21,32 +51,30 @@ def get_model_dir(model_name: str, version: int | str = "latest") -> Path:
     Returns:
         Path to the version directory (e.g. modelzoo/models/uc_power_model/v2/)
     """
-    import yaml
-
-    model_root = MODELZOO_ROOT / model_name
-    model_root = model_root.resolve()
+    model_root = _model_root(MODELZOO_ROOT, model_name)
 
     if isinstance(version, str) and version == "latest":
         index_path = model_root / "index.yaml"
-        if not index_path.exists():
-            raise FileNotFoundError(f"No index.yaml at {index_path}")
-        with index_path.open() as f:
-            index = yaml.safe_load(f)
-        version = index["latest"]["version"]
+        try:
+            st = index_path.stat()
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"No index.yaml at {index_path}") from e
+        version = _latest_version(index_path, st.st_mtime_ns, st.st_size)
 
     return model_root / f"v{version}"
 
 
 def load_model_metadata(model_name: str, version: int | str = "latest") -> dict:
     """Load metadata.yaml for a model version."""
-    import yaml
-
     model_dir = get_model_dir(model_name, version)
     meta_path = model_dir / "metadata.yaml"
-    if not meta_path.exists():
-        raise FileNotFoundError(f"No metadata.yaml at {meta_path}")
-    with meta_path.open() as f:
-        return yaml.safe_load(f)
+    try:
+        st = meta_path.stat()
+        meta = _load_metadata(meta_path, st.st_mtime_ns, st.st_size)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"No metadata.yaml at {meta_path}") from e
+    # Hand out a copy so callers cannot mutate the cached mapping.
+    return copy.deepcopy(meta)
 
 
 def get_model_path(model_name: str, version: int | str = "latest") -> Path:
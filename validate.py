@@ -4,14 +4,22 @@ Validate modelzoo structure and schemas.
 
 Run from ModelZoo repo root:
   python validate.py
-  python validate.py --strict  # also load model.pkl with joblib
+  python validate.py --strict  # also check model.pkl (pickle header, joblib fallback)
+  python validate.py --deep-strict  # always fully load model.pkl with joblib
+  python validate.py --only uc_power_model --fail-fast  # one model, stop at first error
 
 Exit 0 if valid, 1 if invalid. Used by CI (GitHub Actions).
 """
 
 import argparse
+import functools
 import json
+import math
+import mmap
+import os
+import pickle
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -20,28 +28,82 @@ except ImportError:
     print("ERROR: pyyaml required. pip install pyyaml")
     sys.exit(1)
 
-# Required fields for metadata.yaml
-METADATA_REQUIRED = {"model_name", "version", "mlflow", "git", "status", "metrics", "features"}
-MLFLOW_REQUIRED = {"registered_model_name", "model_version", "run_id"}
-GIT_REQUIRED = {"created_at"}
-METADATA_STATUS_VALID = {"staging", "production", "archived", "none"}
-INDEX_REQUIRED = {"model_name", "versions", "latest"}
-FEATURE_SCHEMA_REQUIRED = {"features", "target"}
+# Prefer the LibYAML-backed loader when available; same safe subset, much faster.
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# orjson is optional and only used as a fast path. It is stricter than json
+# (rejects NaN/Infinity and ints beyond 64 bits), so anything it refuses is
+# re-parsed with json; what passes never depends on whether orjson is installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Required fields for metadata.yaml. Checked by hand rather than via a JSON
+# Schema library: pyyaml stays the only dependency and every problem in a
+# file is reported, not just the first one.
+METADATA_REQUIRED = frozenset({"model_name", "version", "mlflow", "git", "status", "metrics", "features"})
+MLFLOW_REQUIRED = frozenset({"registered_model_name", "model_version", "run_id"})
+GIT_REQUIRED = frozenset({"created_at"})
+METADATA_STATUS_VALID = frozenset({"staging", "production", "archived", "none"})
+INDEX_REQUIRED = frozenset({"model_name", "versions", "latest"})
+FEATURE_SCHEMA_REQUIRED = frozenset({"features", "target"})
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+# Keyed on (path, mtime, size): size catches rewrites within one coarse mtime
+# tick, and the bound keeps superseded entries from piling up in watchers.
+@functools.lru_cache(maxsize=1024)
+def _load_yaml_cached(path_str: str, mtime_ns: int, size: int):
+    with open(path_str) as f:
+        return yaml.load(f, Loader=_Loader)
+
+
+@functools.lru_cache(maxsize=1024)
+def _load_json_cached(path_str: str, mtime_ns: int, size: int):
+    with open(path_str, "rb") as f:
+        return _json_loads(f.read())
+
+
+def _load_yaml(path: Path, st: os.stat_result | None = None):
+    """Parse a YAML file; unchanged files (same mtime and size) are served from cache."""
+    if st is None:
+        st = os.stat(path)
+    return _load_yaml_cached(str(path), st.st_mtime_ns, st.st_size)
 
 
-def validate_metadata(path: Path) -> list[str]:
+def _load_json(path: Path, st: os.stat_result | None = None):
+    """Parse a JSON file; unchanged files (same mtime and size) are served from cache."""
+    if st is None:
+        st = os.stat(path)
+    return _load_json_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
+def validate_metadata(path: Path, st: os.stat_result | None = None) -> list[str]:
     """Validate metadata.yaml. Returns list of error messages."""
     errors = []
     try:
-        with path.open() as f:
-            meta = yaml.safe_load(f)
+        # Full load rather than an event-level parse: the checks below need
+        # resolved scalar types and compare nested values (mlflow.model_version).
+        meta = _load_yaml(path, st)
     except Exception as e:
         return [f"Could not parse {path}: {e}"]
 
     if not isinstance(meta, dict):
         return [f"{path}: root must be a mapping"]
 
-    missing = METADATA_REQUIRED - set(meta.keys())
+    missing = METADATA_REQUIRED.difference(meta)
     if missing:
         errors.append(f"{path}: missing required keys: {sorted(missing)}")
 
@@ -53,7 +115,7 @@ def validate_metadata(path: Path) -> list[str]:
         if not isinstance(mlf, dict):
             errors.append(f"{path}: mlflow must be a mapping")
         else:
-            missing_mlf = MLFLOW_REQUIRED - set(mlf.keys())
+            missing_mlf = MLFLOW_REQUIRED.difference(mlf)
             if missing_mlf:
                 errors.append(f"{path}: mlflow missing: {sorted(missing_mlf)}")
             if "model_version" in mlf and "version" in meta:
@@ -71,9 +133,12 @@ def validate_metadata(path: Path) -> list[str]:
             errors.append(f"{path}: git.created_at required")
 
     if "status" in meta:
-        s = str(meta["status"]).lower()
-        if s not in METADATA_STATUS_VALID:
-            errors.append(f"{path}: status must be one of {METADATA_STATUS_VALID}, got '{meta['status']}'")
+        s = meta["status"]
+        # Common case: already a lowercase valid string, no need to build a new one.
+        if not (isinstance(s, str) and s in METADATA_STATUS_VALID) and (
+            str(s).lower() not in METADATA_STATUS_VALID
+        ):
+            errors.append(f"{path}: status must be one of {sorted(METADATA_STATUS_VALID)}, got '{meta['status']}'")
 
     if "features" in meta:
         f = meta["features"]
@@ -85,19 +150,18 @@ def validate_metadata(path: Path) -> list[str]:
     return errors
 
 
-def validate_feature_schema(path: Path) -> list[str]:
+def validate_feature_schema(path: Path, st: os.stat_result | None = None) -> list[str]:
     """Validate feature_schema.json."""
     errors = []
     try:
-        with path.open() as f:
-            schema = json.load(f)
+        schema = _load_json(path, st)
     except Exception as e:
         return [f"Could not parse {path}: {e}"]
 
     if not isinstance(schema, dict):
         return [f"{path}: root must be an object"]
 
-    missing = FEATURE_SCHEMA_REQUIRED - set(schema.keys())
+    missing = FEATURE_SCHEMA_REQUIRED.difference(schema)
     if missing:
         errors.append(f"{path}: missing required keys: {sorted(missing)}")
 
@@ -107,19 +171,18 @@ def validate_feature_schema(path: Path) -> list[str]:
     return errors
 
 
-def validate_index(path: Path, model_root: Path) -> list[str]:
+def validate_index(path: Path, model_root: Path, st: os.stat_result | None = None) -> list[str]:
     """Validate index.yaml and consistency with version dirs."""
     errors = []
     try:
-        with path.open() as f:
-            index = yaml.safe_load(f)
+        index = _load_yaml(path, st)
     except Exception as e:
         return [f"Could not parse {path}: {e}"]
 
     if not isinstance(index, dict):
         return [f"{path}: root must be a mapping"]
 
-    missing = INDEX_REQUIRED - set(index.keys())
+    missing = INDEX_REQUIRED.difference(index)
     if missing:
         errors.append(f"{path}: missing required keys: {sorted(missing)}")
 
@@ -147,21 +210,142 @@ def validate_index(path: Path, model_root: Path) -> list[str]:
     return errors
 
 
-def validate_model_load(path: Path, joblib_module) -> list[str]:
-    """Optionally validate model.pkl loads with joblib."""
+def _pickle_header_ok(path: Path) -> bool:
+    """Cheap structural check of an uncompressed pickle without unpickling it.
+
+    Looks at the PROTO opcode/version at the start, for protocol >= 4 the
+    leading FRAME opcode and that its length fits in the file, and the STOP
+    opcode at the end, via mmap so nothing is copied. A full opcode walk is not
+    possible because joblib writes numpy buffers inline between pickle opcodes.
+    Anything that does not match (including pickles too small to be framed)
+    is left to a full load.
+    """
+    try:
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            # PROTO is only emitted from protocol 2 onwards.
+            if not (
+                size >= 3
+                and mm[0] == pickle.PROTO[0]
+                and 2 <= mm[1] <= pickle.HIGHEST_PROTOCOL
+                and mm[-1] == pickle.STOP[0]
+            ):
+                return False
+            if mm[1] >= 4:
+                if size < 11 or mm[2] != pickle.FRAME[0]:
+                    return False
+                frame_len = int.from_bytes(mm[3:11], "little")
+                return 11 + frame_len <= size
+            return True
+    except (OSError, ValueError):  # unreadable or empty (cannot mmap 0 bytes)
+        return False
+
+
+def validate_model_load(path: Path, load, deep: bool = False) -> list[str]:
+    """Optionally validate model.pkl loads with load (normally joblib.load).
+
+    Unless deep is set, a well-formed pickle header is accepted without loading;
+    anything else (compressed dumps, truncated files) goes through joblib.load.
+    """
+    if not deep and _pickle_header_ok(path):
+        return []
     errors = []
     try:
-        joblib_module.load(path)
+        load(path)
     except Exception as e:
         errors.append(f"{path}: failed to load model: {e}")
     return errors
 
 
+def _version_key(dir_name: str) -> tuple:
+    """Sort key for version dirs: numeric order (v7 before v10), odd names last."""
+    num = dir_name[1:]
+    # ASCII only: str.isdigit() also accepts e.g. "²", which int() rejects.
+    return (int(num), "") if num.isascii() and num.isdigit() else (math.inf, dir_name)
+
+
+def _check_model_file(model_path: Path, load_model, deep: bool = False) -> list[str]:
+    """Strict-mode check of one model.pkl, including whether it exists.
+
+    Runs ahead of the version-dir listing, so it does the only stat of
+    model.pkl itself; _validate_version_dir skips the file in strict mode.
+    """
+    try:
+        size = model_path.stat().st_size
+    except OSError:  # missing, dangling/looping symlink, unreadable
+        return [f"{model_path.parent}: missing model.pkl"]
+    if size == 0:
+        return [f"{model_path}: model.pkl is empty"]
+    return validate_model_load(model_path, load_model, deep=deep)
+
+
+def _entry_stat(entry: os.DirEntry | None) -> os.stat_result | None:
+    """stat() a DirEntry, following symlinks; None if it is absent or unreachable.
+
+    A dangling symlink or a file removed mid-walk counts as missing, as it did
+    with Path.exists().
+    """
+    if entry is None:
+        return None
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
+def _validate_version_dir(v_dir: Path, check_model: bool = True) -> list[str]:
+    """Validate one vN/ directory's metadata, feature schema and file layout.
+
+    check_model=False leaves model.pkl to _check_model_file (strict mode).
+    """
+    errors = []
+    # One directory listing answers every "is it there?" question below, and
+    # each DirEntry's stat() is reused for the parse cache key.
+    try:
+        with os.scandir(v_dir) as it:
+            entries = {e.name: e for e in it}
+    except OSError as e:
+        return [f"{v_dir}: could not list directory: {e}"]
+
+    meta_st = _entry_stat(entries.get("metadata.yaml"))
+    if meta_st is None:
+        errors.append(f"{v_dir}: missing metadata.yaml")
+    else:
+        errors.extend(validate_metadata(v_dir / "metadata.yaml", meta_st))
+
+    schema_st = _entry_stat(entries.get("feature_schema.json"))
+    if schema_st is None:
+        errors.append(f"{v_dir}: missing feature_schema.json")
+    else:
+        errors.extend(validate_feature_schema(v_dir / "feature_schema.json", schema_st))
+
+    if check_model and _entry_stat(entries.get("model.pkl")) is None:
+        errors.append(f"{v_dir}: missing model.pkl")
+
+    return errors
+
+
+def _report(errors: list[str]) -> int:
+    """Print errors (or the OK line) and return the process exit code."""
+    if errors:
+        for e in errors:
+            print(f"ERROR: {e}")
+        return 1
+    print("OK: modelzoo validation passed")
+    return 0
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Validate modelzoo structure")
-    ap.add_argument("--strict", action="store_true", help="Also load model.pkl (requires joblib)")
+    ap.add_argument("--strict", action="store_true", help="Also check model.pkl (requires joblib)")
+    ap.add_argument(
+        "--deep-strict", action="store_true", help="Like --strict, but always fully load model.pkl"
+    )
     ap.add_argument("--root", type=Path, default=Path.cwd(), help="Modelzoo repo root (default: cwd)")
+    ap.add_argument("--only", metavar="MODEL_NAME", help="Validate only models/MODEL_NAME")
+    ap.add_argument("--fail-fast", action="store_true", help="Stop at the first file with errors")
     args = ap.parse_args()
+    args.strict = args.strict or args.deep_strict
     root = args.root.resolve()
 
     models_dir = root / "models"
@@ -169,51 +353,87 @@ def main() -> int:
         print("ERROR: models/ directory not found")
         return 1
 
-    all_errors: list[str] = []
-
-    for model_dir in models_dir.iterdir():
-        if not model_dir.is_dir() or model_dir.name.startswith("."):
-            continue
-        index_path = model_dir / "index.yaml"
-        if not index_path.exists():
-            all_errors.append(f"{model_dir.name}: missing index.yaml")
-            continue
-
-        all_errors.extend(validate_index(index_path, model_dir))
-
-        for v_dir in sorted(model_dir.iterdir()):
-            if not v_dir.is_dir() or not v_dir.name.startswith("v"):
+    load_model = None
+    if args.strict:
+        try:
+            import joblib
+        except ImportError:
+            print("ERROR: joblib required for --strict. pip install joblib")
+            return 1
+        load_model = joblib.load
+
+    # os.scandir keeps the DirEntry type info, so is_dir() needs no extra stat().
+    with os.scandir(models_dir) as models_it:
+        model_entries = [e for e in models_it if e.is_dir() and not e.name.startswith(".")]
+    if args.only is not None:
+        model_entries = [e for e in model_entries if e.name == args.only]
+        if not model_entries:
+            print(f"ERROR: model '{args.only}' not found in models/")
+            return 1
+    if args.fail_fast:
+        # Walk models in report order so stopping at a failing index.yaml never
+        # skips a model whose errors would have been reported before it.
+        model_entries.sort(key=lambda e: e.name)
+
+    # Directories are walked in whatever order scandir returns; each result carries
+    # a (model, version, part) key and they are sorted once at the end instead.
+    # Version dirs are independent and mostly I/O (file reads, libyaml, joblib),
+    # so each is queued on the pool as soon as it is found. In strict mode the
+    # model.pkl check is queued separately and first, so slow joblib loads run
+    # alongside the YAML/JSON checks instead of after them.
+    results: list[tuple[tuple, list[str] | Future]] = []
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for model_entry in model_entries:
+            model_dir = Path(model_entry.path)
+            index_key = (model_entry.name, (-1, ""), 0)
+            try:
+                with os.scandir(model_entry.path) as model_it:
+                    children = list(model_it)
+            except OSError as e:
+                results.append((index_key, [f"{model_dir}: could not list directory: {e}"]))
+                if args.fail_fast:
+                    break
                 continue
-            meta_path = v_dir / "metadata.yaml"
-            schema_path = v_dir / "feature_schema.json"
-            model_path = v_dir / "model.pkl"
 
-            if not meta_path.exists():
-                all_errors.append(f"{v_dir}: missing metadata.yaml")
-            else:
-                all_errors.extend(validate_metadata(meta_path))
+            index_entry = next((e for e in children if e.name == "index.yaml"), None)
+            index_st = _entry_stat(index_entry)
+            if index_st is None:
+                results.append((index_key, [f"{model_dir.name}: missing index.yaml"]))
+                if args.fail_fast:
+                    break
+                continue
 
-            if not schema_path.exists():
-                all_errors.append(f"{v_dir}: missing feature_schema.json")
-            else:
-                all_errors.extend(validate_feature_schema(schema_path))
-
-            if not model_path.exists():
-                all_errors.append(f"{v_dir}: missing model.pkl")
-            elif args.strict:
-                try:
-                    import joblib
-                except ImportError:
-                    all_errors.append("joblib not installed; pip install joblib for --strict")
-                    break  # no point retrying for each model
-                all_errors.extend(validate_model_load(model_path, joblib))
-
-    if all_errors:
-        for e in all_errors:
-            print(f"ERROR: {e}")
-        return 1
-    print("OK: modelzoo validation passed")
-    return 0
+            index_errors = validate_index(model_dir / "index.yaml", model_dir, index_st)
+            results.append((index_key, index_errors))
+            if args.fail_fast and index_errors:
+                break
+
+            for v_entry in children:
+                if not v_entry.is_dir() or not v_entry.name.startswith("v"):
+                    continue
+                v_dir = Path(v_entry.path)
+                v_key = (model_entry.name, _version_key(v_entry.name))
+                if load_model is not None:
+                    future = ex.submit(
+                        _check_model_file, v_dir / "model.pkl", load_model, args.deep_strict
+                    )
+                    results.append((v_key + (1,), future))
+                results.append(
+                    (v_key + (0,), ex.submit(_validate_version_dir, v_dir, load_model is None))
+                )
+
+        results.sort(key=lambda item: item[0])
+        all_errors: list[str] = []
+        for _, errs in results:
+            if isinstance(errs, Future):
+                errs = errs.result()
+            if args.fail_fast and errs:
+                # First failure in report order; drop the checks still queued.
+                ex.shutdown(cancel_futures=True)
+                return _report(errs)
+            all_errors.extend(errs)
+
+    return _report(all_errors)
 
 
 if __name__ == "__main__":